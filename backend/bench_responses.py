@@ -0,0 +1,97 @@
+"""Benchmark the fast response layer against plain Flask jsonify.
+
+Builds the real_income_apis catalog responses both ways inside a request
+context, so the numbers show the response-building cost without the
+WSGI/test-client overhead, and reports the bytes each one puts on the wire.
+
+    python bench_responses.py [iterations]
+"""
+import sys
+import time
+
+from flask import Flask, jsonify
+
+import fast_response
+from real_income_apis import SURVEYS
+
+# A catalog the size the survey list is expected to grow to.
+LARGE_SURVEYS = [
+    dict(survey, id=f"{survey['id']}_{i}") for i in range(20) for survey in SURVEYS
+]
+
+PAYLOADS = [
+    ('surveys', {
+        "surveys": SURVEYS,
+        "total_available": len(SURVEYS),
+        "total_rewards": sum(s['reward'] for s in SURVEYS)
+    }),
+    ('surveys x20', {
+        "surveys": LARGE_SURVEYS,
+        "total_available": len(LARGE_SURVEYS),
+        "total_rewards": sum(s['reward'] for s in LARGE_SURVEYS)
+    }),
+]
+
+CLIENTS = [
+    ('identity', {}),
+    ('gzip', {'Accept-Encoding': 'gzip'}),
+    ('br', {'Accept-Encoding': 'br, gzip'}),
+]
+
+
+ROUNDS = 5
+
+
+def timed(app, headers, build, iterations):
+    """Return (microseconds per response, body bytes) for one client profile.
+
+    The time is the best of ROUNDS rounds, which keeps scheduler noise out
+    of the comparison.
+    """
+    per_round = max(iterations // ROUNDS, 1)
+    with app.test_request_context(headers=headers):
+        response = app.process_response(build())
+        size = len(response.get_data())
+
+        best = float('inf')
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            for _ in range(per_round):
+                app.process_response(build())
+            best = min(best, time.perf_counter() - start)
+    return best / per_round * 1e6, size
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    baseline = Flask('baseline')
+    fast = fast_response.init_app(Flask('fast'))
+
+    print(f'{iterations} responses per row')
+    print(f'{"payload":<13}{"client":<10}{"mode":<8}{"jsonify us":>11}{"fast us":>9}'
+          f'{"jsonify B":>11}{"fast B":>8}')
+    for name, payload in PAYLOADS:
+        frozen = fast_response.frozen_json(payload)
+        for client, headers in CLIENTS:
+            base_us, base_bytes = timed(
+                baseline, headers, lambda: jsonify(dict(payload)), iterations)
+            for mode, build in (
+                ('dynamic', lambda: jsonify(dict(payload))),
+                ('frozen', frozen.response),
+            ):
+                fast_us, fast_bytes = timed(fast, headers, build, iterations)
+                print(f'{name:<13}{client:<10}{mode:<8}{base_us:>11.1f}{fast_us:>9.1f}'
+                      f'{base_bytes:>11}{fast_bytes:>8}')
+
+        with fast.test_request_context():
+            etag = frozen.response().headers['ETag']
+        base_us, base_bytes = timed(
+            baseline, {}, lambda: jsonify(dict(payload)), iterations)
+        fast_us, fast_bytes = timed(
+            fast, {'If-None-Match': etag}, frozen.response, iterations)
+        print(f'{name:<13}{"304":<10}{"frozen":<8}{base_us:>11.1f}{fast_us:>9.1f}'
+              f'{base_bytes:>11}{fast_bytes:>8}')
+
+
+if __name__ == '__main__':
+    main()
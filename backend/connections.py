@@ -0,0 +1,193 @@
+"""Lazy, fork-safe connection handles shared by the Python services.
+
+Nothing here connects (or even imports a client library) at import time.
+Each handle is created on first use in the current process, so a gunicorn
+master can preload the apps and every forked worker builds its own pools
+instead of sharing the master's sockets.
+"""
+import os
+import threading
+
+# Pools hold one connection per request thread, which is all a process can
+# use at once. Under gunicorn, post_fork sizes them to the worker's actual
+# thread count (configure_pools); other servers, like the threaded Flask
+# dev server, get this default.
+DEFAULT_POOL_SIZE = 10
+
+
+def _pool_size(name):
+    return int(os.environ.get(
+        name, os.environ.get('GUNICORN_THREADS', DEFAULT_POOL_SIZE)
+    ))
+
+
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379')
+REDIS_MAX_CONNECTIONS = _pool_size('REDIS_MAX_CONNECTIONS')
+REDIS_TIMEOUT = float(os.environ.get('REDIS_TIMEOUT', 2.0))
+HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', 10))
+DATABASE_URL = os.environ.get('DATABASE_URL')
+# See gunicorn.conf.py for the per-container Postgres budget.
+DB_POOL_MAX_SIZE = _pool_size('DB_POOL_MAX_SIZE')
+DB_POOL_MIN_SIZE = min(int(os.environ.get('DB_POOL_MIN_SIZE', 1)), DB_POOL_MAX_SIZE)
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 5.0))
+# One event loop runs many queries concurrently, so the asyncio pool isn't
+# bounded by request threads.
+DB_ASYNC_POOL_MAX_SIZE = int(os.environ.get('DB_ASYNC_POOL_MAX_SIZE', 10))
+
+_lock = threading.Lock()
+_handles = {}
+
+
+def _get_or_create(name, factory):
+    """Return the per-process handle called name, building it on first use"""
+    pid = os.getpid()
+    entry = _handles.get(name)
+    if entry is None or entry[0] != pid:
+        with _lock:
+            entry = _handles.get(name)
+            if entry is None or entry[0] != pid:
+                entry = (pid, factory())
+                _handles[name] = entry
+    return entry[1]
+
+
+def _create_redis():
+    import redis
+
+    pool = redis.BlockingConnectionPool.from_url(
+        REDIS_URL,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_TIMEOUT,
+        socket_connect_timeout=REDIS_TIMEOUT,
+        socket_timeout=REDIS_TIMEOUT,
+        health_check_interval=30,
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+def _create_http_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def _db_pool_options():
+    return {
+        'min_size': DB_POOL_MIN_SIZE,
+        'max_size': DB_POOL_MAX_SIZE,
+        'timeout': DB_POOL_TIMEOUT,
+    }
+
+
+def _create_db_pool():
+    from psycopg_pool import ConnectionPool
+
+    return ConnectionPool(DATABASE_URL, name='payday', open=True, **_db_pool_options())
+
+
+def _create_async_db_pool():
+    from psycopg_pool import AsyncConnectionPool
+
+    options = _db_pool_options()
+    options['max_size'] = DB_ASYNC_POOL_MAX_SIZE
+    options['min_size'] = min(options['min_size'], DB_ASYNC_POOL_MAX_SIZE)
+    # Opening needs a running event loop; db.get_async_pool() does it.
+    return AsyncConnectionPool(DATABASE_URL, name='payday-async', open=False, **options)
+
+
+def _async_db_key(loop):
+    return f'async_db:{id(loop)}'
+
+
+def get_redis():
+    """Redis client backed by this process's connection pool"""
+    return _get_or_create('redis', _create_redis)
+
+
+def get_redis_script(name, source):
+    """Lua script registered once on this process's Redis client"""
+    client = get_redis()  # outside the factory: _lock isn't reentrant
+    return _get_or_create(f'redis_script:{name}', lambda: client.register_script(source))
+
+
+def get_http_session():
+    """requests.Session with keep-alive pools for the partner APIs"""
+    return _get_or_create('http', _create_http_session)
+
+
+def get_db_pool():
+    """Bounded Postgres connection pool for this process"""
+    return _get_or_create('db', _create_db_pool)
+
+
+def get_async_db_pool():
+    """Bounded asyncio Postgres connection pool for the running loop (unopened).
+
+    An asyncio pool only works on the loop that opened it, so each loop
+    gets its own. The loop is kept with its pool so its id can't be reused
+    while the pool is cached; drop_async_db_pool() releases both.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    return _get_or_create(_async_db_key(loop), lambda: (loop, _create_async_db_pool()))[1]
+
+
+def drop_async_db_pool():
+    """Forget the running loop's asyncio pool and return it, or None"""
+    import asyncio
+
+    with _lock:
+        entry = _handles.pop(_async_db_key(asyncio.get_running_loop()), None)
+    if entry is None or entry[0] != os.getpid():
+        return None
+    return entry[1][1]
+
+
+def configure_pools(threads):
+    """Size the pools to a server's request thread count.
+
+    Settings given explicitly in the environment are left alone. Only
+    affects handles created afterwards, so call it before first use.
+    """
+    global REDIS_MAX_CONNECTIONS, DB_POOL_MAX_SIZE, DB_POOL_MIN_SIZE
+    threads = max(int(threads), 1)
+    if 'REDIS_MAX_CONNECTIONS' not in os.environ:
+        REDIS_MAX_CONNECTIONS = threads
+    if 'DB_POOL_MAX_SIZE' not in os.environ:
+        DB_POOL_MAX_SIZE = threads
+    DB_POOL_MIN_SIZE = min(int(os.environ.get('DB_POOL_MIN_SIZE', 1)), DB_POOL_MAX_SIZE)
+
+
+def reset_after_fork():
+    """Forget handles inherited from the parent process.
+
+    The pid check already keeps children from using them; this just lets
+    the inherited objects be garbage collected without closing the
+    parent's sockets.
+    """
+    with _lock:
+        _handles.clear()
+
+
+def warm_redis():
+    """Open a Redis connection and make sure the server answers"""
+    return bool(get_redis().ping())
+
+
+def warm_http_session():
+    """Build the HTTP session so the first partner call doesn't pay for it"""
+    get_http_session()
+    return True
+
+
+def warm_db():
+    """Open the Postgres pool and check a connection out of it"""
+    with get_db_pool().connection() as conn:
+        conn.execute('SELECT 1')
+    return True
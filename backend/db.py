@@ -0,0 +1,288 @@
+"""Postgres data access for the Python services.
+
+Queries run on the bounded per-process pools from connections.py. Hot
+queries are sent with prepare=True, so each pooled connection parses and
+plans them once and then only binds parameters. Bulk inserts go through
+executemany, which psycopg pipelines into a single round trip.
+
+Money columns are cast to float8 in SQL so results serialize as JSON
+numbers, the same as the rest of the API. Day and month boundaries are
+computed in SQL in SERVICE_TIMEZONE, the same KST day the walking step
+counters use, whatever the server or session time zone is.
+
+Driver errors are translated at the connection boundary: an unreachable
+server or an exhausted pool raises DatabaseUnavailable, and a write for a
+user that doesn't exist raises UserNotFound.
+"""
+from contextlib import asynccontextmanager, contextmanager
+
+import connections
+
+SERVICE_TIMEZONE = 'Asia/Seoul'
+
+GET_USER = """
+    SELECT id, email, name, role, is_active, settings, created_at
+    FROM users
+    WHERE id = %s
+"""
+
+GET_EARNINGS_TOTALS = """
+    WITH bounds AS (
+        SELECT
+            date_trunc('day', now(), %(tz)s) AS today,
+            date_trunc('month', now(), %(tz)s) AS this_month,
+            EXTRACT(DAY FROM now() AT TIME ZONE %(tz)s) AS day_of_month
+    )
+    SELECT
+        COALESCE(SUM(amount) FILTER (WHERE date >= bounds.today), 0)::float8
+            AS today_earnings,
+        COALESCE(SUM(amount) FILTER (WHERE date >= bounds.this_month), 0)::float8
+            AS this_month_earnings,
+        COALESCE(SUM(amount), 0)::float8 AS total_earnings,
+        ROUND(COALESCE(SUM(amount) FILTER (WHERE date >= bounds.this_month), 0)
+              / bounds.day_of_month)::float8 AS daily_average
+    FROM bounds
+    LEFT JOIN earnings ON earnings.user_id = %(user_id)s
+    GROUP BY bounds.today, bounds.this_month, bounds.day_of_month
+"""
+
+GET_EARNINGS_BY_SOURCE = """
+    SELECT source AS name, SUM(amount)::float8 AS earnings
+    FROM earnings
+    WHERE user_id = %s
+    GROUP BY source
+    ORDER BY earnings DESC
+"""
+
+INSERT_EARNING = """
+    INSERT INTO earnings (user_id, source, amount, description, type, date)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+GET_CONNECTED_PLATFORMS = """
+    SELECT platform_id, connected_at
+    FROM platform_connections
+    WHERE user_id = %s AND status = 'connected'
+    ORDER BY connected_at
+"""
+
+UPSERT_PLATFORM_CONNECTION = """
+    INSERT INTO platform_connections (user_id, platform_id, status, connected_at)
+    VALUES (%s, %s, 'connected', now())
+    ON CONFLICT (user_id, platform_id) DO UPDATE
+    SET status = 'connected', connected_at = now(), disconnected_at = NULL
+"""
+
+DISCONNECT_PLATFORM = """
+    UPDATE platform_connections
+    SET status = 'disconnected', disconnected_at = now()
+    WHERE user_id = %s AND platform_id = %s AND status = 'connected'
+"""
+
+
+class DatabaseUnavailable(Exception):
+    """Postgres is unreachable or the pool had no free connection in time"""
+
+
+class UserNotFound(Exception):
+    """The user id doesn't exist in users"""
+
+
+def is_configured():
+    """Whether DATABASE_URL is set for this service"""
+    return bool(connections.DATABASE_URL)
+
+
+def _row_factory():
+    from psycopg.rows import dict_row
+
+    return dict_row
+
+
+def _translate(e):
+    """Map a driver error to this module's exceptions, or None to re-raise"""
+    import psycopg
+
+    if isinstance(e, psycopg.errors.ForeignKeyViolation):
+        return UserNotFound(str(e))
+    # PoolTimeout is an OperationalError too.
+    if isinstance(e, psycopg.OperationalError):
+        return DatabaseUnavailable(str(e))
+    return None
+
+
+@contextmanager
+def _connection():
+    """Check a connection out of the sync pool, translating driver errors"""
+    try:
+        with connections.get_db_pool().connection() as conn:
+            yield conn
+    except Exception as e:
+        translated = _translate(e)
+        if translated is None:
+            raise
+        raise translated from e
+
+
+@asynccontextmanager
+async def _aconnection():
+    """Check a connection out of the asyncio pool, translating driver errors"""
+    try:
+        pool = await get_async_pool()
+        async with pool.connection() as conn:
+            yield conn
+    except Exception as e:
+        translated = _translate(e)
+        if translated is None:
+            raise
+        raise translated from e
+
+
+# Sync helpers
+
+def fetch_one(query, params=(), prepare=None):
+    """Run a query and return the first row as a dict, or None"""
+    with _connection() as conn:
+        with conn.cursor(row_factory=_row_factory()) as cur:
+            cur.execute(query, params, prepare=prepare)
+            return cur.fetchone()
+
+
+def fetch_all(query, params=(), prepare=None):
+    """Run a query and return every row as a dict"""
+    with _connection() as conn:
+        with conn.cursor(row_factory=_row_factory()) as cur:
+            cur.execute(query, params, prepare=prepare)
+            return cur.fetchall()
+
+
+def execute(query, params=(), prepare=None):
+    """Run a write in its own transaction and return the affected row count"""
+    with _connection() as conn:
+        cur = conn.execute(query, params, prepare=prepare)
+        return cur.rowcount
+
+
+def execute_many(query, rows):
+    """Run a write for every row in one pipelined round trip and transaction"""
+    rows = list(rows)
+    if not rows:
+        return 0
+    with _connection() as conn:
+        with conn.cursor() as cur:
+            cur.executemany(query, rows)
+    return len(rows)
+
+
+# Async helpers (same queries, asyncio pool)
+
+async def get_async_pool():
+    """The running event loop's asyncio pool, opened on first use"""
+    pool = connections.get_async_db_pool()
+    await pool.open()
+    return pool
+
+
+async def close_async_pool():
+    """Close the running loop's asyncio pool; the next query opens a new one.
+
+    Call it before the loop ends (e.g. at the end of asyncio.run()).
+    """
+    pool = connections.drop_async_db_pool()
+    if pool is not None:
+        await pool.close()
+
+
+async def afetch_one(query, params=(), prepare=None):
+    async with _aconnection() as conn:
+        async with conn.cursor(row_factory=_row_factory()) as cur:
+            await cur.execute(query, params, prepare=prepare)
+            return await cur.fetchone()
+
+
+async def afetch_all(query, params=(), prepare=None):
+    async with _aconnection() as conn:
+        async with conn.cursor(row_factory=_row_factory()) as cur:
+            await cur.execute(query, params, prepare=prepare)
+            return await cur.fetchall()
+
+
+async def aexecute_many(query, rows):
+    rows = list(rows)
+    if not rows:
+        return 0
+    async with _aconnection() as conn:
+        async with conn.cursor() as cur:
+            await cur.executemany(query, rows)
+    return len(rows)
+
+
+# Queries
+
+def get_user(user_id):
+    return fetch_one(GET_USER, (user_id,), prepare=True)
+
+
+def get_earnings_summary(user_id):
+    """Today / this month / all-time totals plus per-source breakdown.
+
+    Returns None if the user doesn't exist.
+    """
+    with _connection() as conn:
+        with conn.cursor(row_factory=_row_factory()) as cur:
+            cur.execute(GET_USER, (user_id,), prepare=True)
+            if cur.fetchone() is None:
+                return None
+            cur.execute(
+                GET_EARNINGS_TOTALS,
+                {'user_id': user_id, 'tz': SERVICE_TIMEZONE},
+                prepare=True,
+            )
+            summary = cur.fetchone()
+            cur.execute(GET_EARNINGS_BY_SOURCE, (user_id,), prepare=True)
+            summary['platforms'] = cur.fetchall()
+    return summary
+
+
+def add_earnings(earnings):
+    """Insert many earnings in one batch.
+
+    Each item is (user_id, source, amount, description, type, date).
+    """
+    return execute_many(INSERT_EARNING, earnings)
+
+
+def get_connected_platforms(user_id):
+    return fetch_all(GET_CONNECTED_PLATFORMS, (user_id,), prepare=True)
+
+
+def connect_platform(user_id, platform_id):
+    """Raises UserNotFound if the user doesn't exist"""
+    execute(UPSERT_PLATFORM_CONNECTION, (user_id, platform_id), prepare=True)
+
+
+def disconnect_platform(user_id, platform_id):
+    """Returns True if the platform was connected"""
+    return execute(DISCONNECT_PLATFORM, (user_id, platform_id), prepare=True) > 0
+
+
+# Metrics
+
+def pool_metrics():
+    """Pool size, usage and wait counters for the sync pool.
+
+    The pool's max_size is the most this worker can ever hold (it defaults
+    to the worker's request threads), so saturation = in_use / pool_max is
+    the share of the worker's connection budget in use. Sustained 1.0 with
+    requests_waiting > 0 means requests are queuing for a connection.
+    """
+    if not is_configured():
+        return {'configured': False}
+    stats = connections.get_db_pool().get_stats()
+    in_use = stats.get('pool_size', 0) - stats.get('pool_available', 0)
+    return {
+        'configured': True,
+        'in_use': in_use,
+        'saturation': round(in_use / stats['pool_max'], 3),
+        **stats,
+    }
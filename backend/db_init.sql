@@ -89,8 +89,20 @@ CREATE TABLE IF NOT EXISTS payments (
     processed_at TIMESTAMPTZ
 );
 
+-- Platform Connections Table
+CREATE TABLE IF NOT EXISTS platform_connections (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+    platform_id VARCHAR(100) NOT NULL, -- coupang_partners, youtube, etc.
+    status VARCHAR(50) DEFAULT 'connected', -- connected, disconnected
+    connected_at TIMESTAMPTZ DEFAULT NOW(),
+    disconnected_at TIMESTAMPTZ,
+    UNIQUE (user_id, platform_id)
+);
+
 -- Add indexes for frequently queried columns
 CREATE INDEX IF NOT EXISTS idx_earnings_user_id ON earnings(user_id);
+CREATE INDEX IF NOT EXISTS idx_earnings_user_id_date ON earnings(user_id, date);
 CREATE INDEX IF NOT EXISTS idx_goals_user_id ON goals(user_id);
 CREATE INDEX IF NOT EXISTS idx_tasks_user_id ON tasks(user_id);
 CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
@@ -0,0 +1,183 @@
+"""Shared response layer for the Python services.
+
+Swaps Flask's JSON provider for orjson, adds ETag / If-None-Match handling
+and negotiates gzip or brotli compression for JSON bodies above a size
+threshold. Payloads that never change can be serialized once with
+`frozen_json` and served from precomputed bytes.
+"""
+import gzip
+import hashlib
+import json
+import os
+
+from flask import current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip only
+    brotli = None
+
+# Bodies smaller than this are sent as-is; compressing them costs more CPU
+# than it saves on the wire.
+COMPRESS_MIN_SIZE = int(os.environ.get('RESPONSE_COMPRESS_MIN_SIZE', 500))
+# Levels for bodies compressed per request. Brotli above 4 costs more CPU
+# than building the response; FrozenJSON compresses once at the maximum.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+
+JSON_MIMETYPE = 'application/json'
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def dumps(obj, default=DefaultJSONProvider.default):
+    """Serialize obj to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=ORJSON_OPTIONS)
+    return json.dumps(
+        obj, default=default, ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+def make_etag(body):
+    """Strong ETag for a response body"""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def choose_encoding(body_size):
+    """Pick the best Content-Encoding the client accepts, or None"""
+    if body_size < COMPRESS_MIN_SIZE:
+        return None
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(body, encoding, best=False):
+    """Compress body with the given Content-Encoding"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=11 if best else BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=9 if best else GZIP_LEVEL)
+
+
+def _tag(response, etag, encoding):
+    """Set the ETag for the chosen representation and answer 304 if it matches.
+
+    Each encoding is a distinct representation, so it gets its own tag.
+    Returns True when the response was turned into a 304.
+    """
+    tag = f'{etag}-{encoding}' if encoding else etag
+    response.headers['ETag'] = f'"{tag}"'
+    if 'HTTP_IF_NONE_MATCH' not in request.environ:
+        return False
+    if not request.if_none_match.contains_weak(tag):
+        return False
+    response.status_code = 304
+    response.set_data(b'')
+    return True
+
+
+def _add_vary(response):
+    vary = response.headers.get('Vary')
+    response.headers['Vary'] = f'{vary}, Accept-Encoding' if vary else 'Accept-Encoding'
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes with orjson and skips the str round trip"""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, default=self.default).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = dumps(obj, default=self.default)
+        response = self._app.response_class(body, mimetype=self.mimetype)
+        # Lets finalize_response skip re-reading and re-checking the body.
+        response.json_body = body
+        return response
+
+
+class FrozenJSON:
+    """A JSON payload serialized once, with its ETag and compressed variants"""
+
+    def __init__(self, payload):
+        self.body = dumps(payload)
+        self.etag = make_etag(self.body)
+        self._encoded = {}
+
+    def encoded(self, encoding):
+        """Body for the given Content-Encoding, compressed on first use"""
+        if encoding is None:
+            return self.body
+        if encoding not in self._encoded:
+            self._encoded[encoding] = compress(self.body, encoding, best=True)
+        return self._encoded[encoding]
+
+    def response(self, status=200):
+        """Build a response from the precomputed body"""
+        encoding = choose_encoding(len(self.body))
+        response = current_app.response_class(
+            self.encoded(encoding), status=status, mimetype=JSON_MIMETYPE
+        )
+        if len(self.body) >= COMPRESS_MIN_SIZE:
+            _add_vary(response)
+        if status == 200 and request.method in ('GET', 'HEAD'):
+            if _tag(response, self.etag, encoding):
+                return response
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        return response
+
+
+def frozen_json(payload):
+    """Serialize a payload that never changes so handlers can reuse it"""
+    return FrozenJSON(payload)
+
+
+def finalize_response(response):
+    """after_request hook: ETag, conditional GET and compression for jsonify.
+
+    Only responses built by FastJSONProvider whose body hasn't been replaced
+    are touched. Small bodies skip Vary and compression, and only 200
+    GET/HEAD responses are hashed for an ETag, so a small dynamic response
+    costs one hash and one header.
+    """
+    body = getattr(response, 'json_body', None)
+    if body is None or response.response != [body]:
+        return response
+
+    size = len(body)
+    encoding = choose_encoding(size)
+    if size >= COMPRESS_MIN_SIZE:
+        _add_vary(response)
+    if response.status_code == 200 and request.method in ('GET', 'HEAD'):
+        if _tag(response, make_etag(body), encoding):
+            return response
+    if encoding:
+        response.set_data(compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_app(app):
+    """Install the fast JSON provider and response hook on a Flask app"""
+    app.json = FastJSONProvider(app)
+    app.after_request(finalize_response)
+    return app
@@ -0,0 +1,81 @@
+"""gunicorn settings shared by the Python services.
+
+    gunicorn -c gunicorn.conf.py 'passive_income_api:create_app()'
+
+The app is imported once in the master (preload_app) and workers are
+forked from it, so imports and app setup are paid once per container
+instead of once per worker. Connections are never opened in the master;
+each worker builds its own pools after the fork and warms them before it
+accepts requests.
+
+Connection budget per container: every worker has its own pools, each
+sized in post_fork to the worker's thread count (GUNICORN_THREADS or
+--threads) unless REDIS_MAX_CONNECTIONS / DB_POOL_MAX_SIZE are set, so
+
+    Redis connections    <= workers x REDIS_MAX_CONNECTIONS
+    Postgres connections <= workers x DB_POOL_MAX_SIZE
+
+With the defaults (at most MAX_DEFAULT_WORKERS workers, 1 thread) that is
+at most 8 of each per container. Keep replicas x workers x DB_POOL_MAX_SIZE
+under Postgres's max_connections (100 by default) when raising
+WEB_CONCURRENCY, the thread count or the replica count.
+"""
+import gc
+import math
+import os
+
+MAX_DEFAULT_WORKERS = 8
+
+
+def available_cpus():
+    """CPUs this container may actually use.
+
+    os.cpu_count() reports the host's CPUs. The cgroup v2 quota and the
+    scheduler affinity mask reflect the container's limits.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get(
+    'WEB_CONCURRENCY', min(available_cpus() * 2 + 1, MAX_DEFAULT_WORKERS)
+))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+keepalive = 5
+preload_app = True
+# Recycle workers now and then so a slow leak can't take a container down.
+max_requests = 5000
+max_requests_jitter = 500
+accesslog = '-'
+
+
+def when_ready(server):
+    # Everything the master imported is shared with the workers; keep the GC
+    # from touching those objects so their pages stay copy-on-write shared.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    import connections
+
+    connections.reset_after_fork()
+    connections.configure_pools(worker.cfg.threads)
+
+
+def post_worker_init(worker):
+    import health
+
+    results = health.run_readiness_checks(worker.wsgi)
+    worker.log.info('Worker %s warm-up: %s', worker.pid, results)
@@ -0,0 +1,67 @@
+"""Liveness and readiness endpoints for the Python services.
+
+/healthz only says the worker is up. /readyz runs the app's readiness
+checks, which also warm its connection pools, and answers 503 until all of
+them pass so the load balancer keeps traffic away from a cold worker.
+/metrics reports whatever the app's metrics providers return, such as
+connection pool usage.
+"""
+import logging
+
+from flask import Blueprint, current_app, jsonify
+
+logger = logging.getLogger(__name__)
+
+health_bp = Blueprint('health', __name__)
+
+
+def register_readiness_check(app, name, check):
+    """Add a check that returns truthy once the dependency is usable"""
+    app.extensions.setdefault('readiness_checks', {})[name] = check
+
+
+def register_metrics_provider(app, name, provider):
+    """Add a callable whose dict result is reported under name on /metrics"""
+    app.extensions.setdefault('metrics_providers', {})[name] = provider
+
+
+def run_readiness_checks(app):
+    """Run every readiness check, returning {name: passed}"""
+    results = {}
+    for name, check in app.extensions.get('readiness_checks', {}).items():
+        try:
+            results[name] = bool(check())
+        except Exception as e:
+            logger.warning('Readiness check %s failed: %s', name, e)
+            results[name] = False
+    return results
+
+
+@health_bp.route('/healthz', methods=['GET'])
+def liveness():
+    """Worker is alive"""
+    return jsonify({'status': 'ok'})
+
+
+@health_bp.route('/readyz', methods=['GET'])
+def readiness():
+    """Dependencies are reachable and pools are warm"""
+    checks = run_readiness_checks(current_app)
+    ready = all(checks.values())
+    return jsonify({
+        'status': 'ready' if ready else 'unavailable',
+        'checks': checks,
+    }), 200 if ready else 503
+
+
+@health_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Per-worker metrics from the registered providers"""
+    results = {}
+    for name, provider in current_app.extensions.get('metrics_providers', {}).items():
+        try:
+            results[name] = provider()
+        except Exception as e:
+            logger.warning('Metrics provider %s failed: %s', name, e)
+            results[name] = {'error': str(e)}
+    return jsonify(results)
@@ -1,18 +1,16 @@
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, request, jsonify
 from flask_cors import CORS
 from datetime import datetime, timedelta
-import redis
 import json
 import random
 import hashlib
 import os
 
-app = Flask(__name__)
-CORS(app)
+import connections
+import fast_response
+import health
 
-# Redis configuration
-REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379')
-redis_client = redis.from_url(REDIS_URL)
+bp = Blueprint('passive_income', __name__)
 
 # Constants
 MINING_RATE_PER_HOUR = 100.0
@@ -27,7 +25,7 @@ def get_user_key(user_id):
 def get_user_data(user_id):
     """Get user data from Redis"""
     key = get_user_key(user_id)
-    data = redis_client.get(key)
+    data = connections.get_redis().get(key)
     if data:
         return json.loads(data)
     return {
@@ -50,7 +48,7 @@ def save_user_data(user_id, data):
     """Save user data to Redis"""
     key = get_user_key(user_id)
     data['last_sync'] = datetime.now().isoformat()
-    redis_client.set(key, json.dumps(data), ex=86400 * 30)  # Expire after 30 days
+    connections.get_redis().set(key, json.dumps(data), ex=86400 * 30)  # Expire after 30 days
 
 def calculate_mining_earnings(user_data):
     """Calculate mining earnings since last sync"""
@@ -80,7 +78,7 @@ def calculate_staking_rewards(user_data):
 
 # API Endpoints
 
-@app.route('/api/passive-income/sync', methods=['GET'])
+@bp.route('/api/passive-income/sync', methods=['GET'])
 def sync_data():
     """Sync user data with backend"""
     user_id = request.headers.get('X-User-Id', 'default')
@@ -111,7 +109,7 @@ def sync_data():
         'totalEarnings': user_data['total_earnings'],
     })
 
-@app.route('/api/passive-income/mining/start', methods=['POST'])
+@bp.route('/api/passive-income/mining/start', methods=['POST'])
 def start_mining():
     """Start mining"""
     user_id = request.headers.get('X-User-Id', 'default')
@@ -124,7 +122,7 @@ def start_mining():
 
     return jsonify({'success': True})
 
-@app.route('/api/passive-income/mining/stop', methods=['POST'])
+@bp.route('/api/passive-income/mining/stop', methods=['POST'])
 def stop_mining():
     """Stop mining"""
     user_id = request.headers.get('X-User-Id', 'default')
@@ -142,7 +140,7 @@ def stop_mining():
 
     return jsonify({'success': True, 'earnings': earnings})
 
-@app.route('/api/passive-income/mining/earnings', methods=['GET'])
+@bp.route('/api/passive-income/mining/earnings', methods=['GET'])
 def get_mining_earnings():
     """Get current mining earnings"""
     user_id = request.headers.get('X-User-Id', 'default')
@@ -152,7 +150,7 @@ def get_mining_earnings():
 
     return jsonify({'earnings': earnings})
 
-@app.route('/api/passive-income/mining/upgrade', methods=['POST'])
+@bp.route('/api/passive-income/mining/upgrade', methods=['POST'])
 def upgrade_mining():
     """Upgrade mining power"""
     user_id = request.headers.get('X-User-Id', 'default')
@@ -174,7 +172,7 @@ def upgrade_mining():
         'balance': user_data['balance']
     })
 
-@app.route('/api/passive-income/autoclick/upgrade', methods=['POST'])
+@bp.route('/api/passive-income/autoclick/upgrade', methods=['POST'])
 def upgrade_autoclick():
     """Upgrade auto-click level"""
     user_id = request.headers.get('X-User-Id', 'default')
@@ -196,7 +194,7 @@ def upgrade_autoclick():
         'balance': user_data['balance']
     })
 
-@app.route('/api/passive-income/staking/start', methods=['POST'])
+@bp.route('/api/passive-income/staking/start', methods=['POST'])
 def start_staking():
     """Start staking"""
     user_id = request.headers.get('X-User-Id', 'default')
@@ -215,7 +213,7 @@ def start_staking():
 
     return jsonify({'success': True})
 
-@app.route('/api/passive-income/staking/rewards', methods=['GET'])
+@bp.route('/api/passive-income/staking/rewards', methods=['GET'])
 def get_staking_rewards():
     """Get staking rewards"""
     user_id = request.headers.get('X-User-Id', 'default')
@@ -225,7 +223,7 @@ def get_staking_rewards():
 
     return jsonify({'rewards': rewards})
 
-@app.route('/api/passive-income/bonus/daily', methods=['POST'])
+@bp.route('/api/passive-income/bonus/daily', methods=['POST'])
 def claim_daily_bonus():
     """Claim daily bonus"""
     user_id = request.headers.get('X-User-Id', 'default')
@@ -245,7 +243,7 @@ def claim_daily_bonus():
 
     return jsonify({'success': True, 'amount': bonus})
 
-@app.route('/api/passive-income/bonus/wheel', methods=['POST'])
+@bp.route('/api/passive-income/bonus/wheel', methods=['POST'])
 def spin_wheel():
     """Spin lucky wheel"""
     user_id = request.headers.get('X-User-Id', 'default')
@@ -267,7 +265,7 @@ def spin_wheel():
 
     return jsonify({'success': True, 'prize': prize})
 
-@app.route('/api/passive-income/bonus/mystery-box', methods=['POST'])
+@bp.route('/api/passive-income/bonus/mystery-box', methods=['POST'])
 def open_mystery_box():
     """Open mystery box"""
     user_id = request.headers.get('X-User-Id', 'default')
@@ -305,7 +303,7 @@ def open_mystery_box():
         'amount': amount
     })
 
-@app.route('/api/passive-income/balance/update', methods=['POST'])
+@bp.route('/api/passive-income/balance/update', methods=['POST'])
 def update_balance():
     """Update user balance"""
     user_id = request.headers.get('X-User-Id', 'default')
@@ -318,7 +316,7 @@ def update_balance():
 
     return jsonify({'success': True})
 
-@app.route('/api/passive-income/state/save', methods=['POST'])
+@bp.route('/api/passive-income/state/save', methods=['POST'])
 def save_state():
     """Save complete state"""
     user_id = request.headers.get('X-User-Id', 'default')
@@ -334,6 +332,16 @@ def save_state():
 
     return jsonify({'success': True})
 
+def create_app():
+    """Build the passive income app; Redis is connected lazily per worker"""
+    app = Flask(__name__)
+    CORS(app)
+    fast_response.init_app(app)
+    app.register_blueprint(bp)
+    app.register_blueprint(health.health_bp)
+    health.register_readiness_check(app, 'redis', connections.warm_redis)
+    return app
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port)
\ No newline at end of file
+    create_app().run(host='0.0.0.0', port=port)
\ No newline at end of file
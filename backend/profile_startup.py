@@ -0,0 +1,64 @@
+"""Profile cold start of the Python services.
+
+Runs each service in a fresh interpreter with `-X importtime`, then reports
+the time to import the module, the time to build the app with
+create_app(), and the slowest top-level imports.
+
+    python profile_startup.py [module ...]
+"""
+import os
+import subprocess
+import sys
+
+SERVICES = ['passive_income_api', 'real_income_apis']
+TOP_IMPORTS = 8
+
+SNIPPET = '''
+import time
+t0 = time.perf_counter()
+import {module}
+t1 = time.perf_counter()
+{module}.create_app()
+t2 = time.perf_counter()
+print(f"{{(t1 - t0) * 1e3:.1f}} {{(t2 - t1) * 1e3:.1f}}")
+'''
+
+
+def profile(module):
+    """Return (import ms, create_app ms, [(cumulative us, name)]) for module"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', SNIPPET.format(module=module)],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    import_ms, create_ms = (float(x) for x in result.stdout.split())
+
+    # -X importtime lists children before their parent, so collect the
+    # one-level-deep entries and keep them once the parent is the service.
+    imports, pending = [], []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):
+            if name.strip() == module:
+                imports = pending
+            pending = []
+        elif not name.startswith('     '):
+            pending.append((int(cumulative), name.strip()))
+    imports.sort(reverse=True)
+    return import_ms, create_ms, imports[:TOP_IMPORTS]
+
+
+def main():
+    for module in sys.argv[1:] or SERVICES:
+        import_ms, create_ms, imports = profile(module)
+        print(f'{module}: import {import_ms:.1f} ms, create_app {create_ms:.1f} ms')
+        for cumulative, name in imports:
+            print(f'  {cumulative / 1e3:8.1f} ms  {name}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,20 @@
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, current_app, request, jsonify
 from flask_cors import CORS
 import os
-import requests
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 import hashlib
 import hmac
 import json
+import uuid
+import zlib
 
-app = Flask(__name__)
-CORS(app)
+import connections
+import db
+import fast_response
+import health
+from fast_response import frozen_json
+
+bp = Blueprint('real_income', __name__)
 
 # API Keys (환경변수로 관리)
 COUPANG_ACCESS_KEY = os.environ.get('COUPANG_ACCESS_KEY')
@@ -52,7 +58,7 @@ class CoupangPartners:
             "Content-Type": "application/json"
         }
 
-        response = requests.get(
+        response = connections.get_http_session().get(
             f"{self.base_url}{path}",
             headers=headers,
             params=params
@@ -73,7 +79,7 @@ class CoupangPartners:
             "Content-Type": "application/json"
         }
 
-        response = requests.get(
+        response = connections.get_http_session().get(
             f"{self.base_url}{path}",
             headers=headers,
             params=params
@@ -96,7 +102,7 @@ class YouTubeAnalytics:
             "key": self.api_key
         }
 
-        response = requests.get(url, params=params)
+        response = connections.get_http_session().get(url, params=params)
         return response.json() if response.status_code == 200 else None
 
     def get_estimated_revenue(self, channel_id):
@@ -134,24 +140,301 @@ class NaverAdPost:
             "display": 10
         }
 
-        response = requests.get(url, headers=headers, params=params)
+        response = connections.get_http_session().get(url, headers=headers, params=params)
         return response.json() if response.status_code == 200 else None
 
+# 걷기 앱별 보상 규칙
+# rate: 걸음당 보상, cap: 하루 최대 보상, threshold: 보상이 시작되는 최소 걸음 수
+WALKING_REWARD_RULES = {
+    'cashwalk': {'rate': 0.01, 'cap': 200, 'threshold': 0},   # 100보당 1캐시, 최대 200
+    'toss': {'rate': 0.0911, 'cap': 911, 'threshold': 0},     # 만보 달성 시 911원
+    'cashdoc': {'rate': 0.01, 'cap': 150, 'threshold': 0},
+}
+
+WALKING_TZ = timezone(timedelta(hours=9))  # 걸음 수는 한국 시간 자정 기준으로 집계
+WALKING_KEY_TTL = 86400 * 30
+MAX_STEP_BATCH_POINTS = 10000
+MAX_STEP_BATCH_BYTES = 1024 * 1024
+MAX_STEP_DELTA = 50000       # 샘플 하나에 들어올 수 있는 최대 걸음 수
+MAX_DAILY_STEPS = 200000     # 하루 누적 걸음 수 상한 (초과분은 버림)
+MAX_CLOCK_SKEW = 300         # 단말 시계가 서버보다 앞서도 되는 시간(초)
+MAX_WALKING_APPS = 20
+MAX_BATCH_ID_LENGTH = 64
+
+# 배치 중복 확인과 일별 누적을 한 번에 원자적으로 처리
+# KEYS[1]: 배치 키 (batch_id 없으면 ''), KEYS[2..]: 일별 걸음 수 키
+# ARGV[1]: TTL, ARGV[2]: 하루 상한, ARGV[3..]: 일별 증가분
+INCR_DAILY_STEPS_SCRIPT = """
+local duplicate = 0
+if KEYS[1] ~= '' and not redis.call('SET', KEYS[1], 1, 'NX', 'EX', ARGV[1]) then
+    duplicate = 1
+end
+local totals = {}
+for i = 2, #KEYS do
+    local total = tonumber(redis.call('GET', KEYS[i]) or '0')
+    if duplicate == 0 then
+        total = math.min(total + tonumber(ARGV[i + 1]), tonumber(ARGV[2]))
+        redis.call('SET', KEYS[i], total, 'EX', ARGV[1])
+    end
+    totals[#totals + 1] = total
+end
+return {duplicate, totals}
+"""
+
+def calculate_walking_rewards(steps, apps):
+    """규칙 테이블 기반 앱별 보상 계산"""
+    earnings = {}
+    for app_id in apps:
+        rule = WALKING_REWARD_RULES.get(app_id)
+        if rule is None:
+            continue
+        if steps < rule['threshold']:
+            earnings[app_id] = 0
+        else:
+            earnings[app_id] = round(min(steps * rule['rate'], rule['cap']), 2)
+    return earnings
+
+def _read_body(limit):
+    """요청 본문을 최대 limit 바이트까지만 읽기 (chunked 요청 포함)"""
+    if request.content_length is not None and request.content_length > limit:
+        raise ValueError("batch too large")
+    chunks = []
+    size = 0
+    while True:
+        chunk = request.stream.read(min(64 * 1024, limit + 1 - size))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            raise ValueError("batch too large")
+    return b''.join(chunks)
+
+def parse_step_batch():
+    """걸음 수 배치 요청 파싱 (gzip 압축 본문 지원)
+
+    압축 전후 모두 MAX_STEP_BATCH_BYTES를 넘으면 거부한다.
+    """
+    body = _read_body(MAX_STEP_BATCH_BYTES)
+    if request.content_encoding == 'gzip':
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            body = decompressor.decompress(body, MAX_STEP_BATCH_BYTES)
+        except zlib.error:
+            raise ValueError("invalid gzip body")
+        if decompressor.unconsumed_tail:
+            raise ValueError("batch too large")
+    elif request.content_encoding:
+        raise ValueError(f"unsupported encoding: {request.content_encoding}")
+
+    data = current_app.json.loads(body)
+    if not isinstance(data, dict):
+        raise ValueError("batch must be an object")
+
+    start = data.get('start')
+    offsets = data.get('offsets', [])
+    steps = data.get('steps', [])
+    apps = data.get('apps', [])
+    batch_id = data.get('batch_id')
+
+    if not isinstance(offsets, list) or not isinstance(steps, list) or len(offsets) != len(steps):
+        raise ValueError("offsets and steps must be arrays of the same length")
+    if len(steps) > MAX_STEP_BATCH_POINTS:
+        raise ValueError(f"at most {MAX_STEP_BATCH_POINTS} samples per batch")
+    if not all(map(_is_count, offsets)) or not all(map(_is_count, steps)):
+        raise ValueError("offsets and steps must be non-negative integers")
+    if any(delta > MAX_STEP_DELTA for delta in steps):
+        raise ValueError(f"at most {MAX_STEP_DELTA} steps per sample")
+
+    # 보관 기간(WALKING_KEY_TTL) 안의 과거부터 현재까지만 허용
+    now = int(datetime.now(timezone.utc).timestamp())
+    if not _is_count(start) or start < now - WALKING_KEY_TTL:
+        raise ValueError("start must be a unix timestamp within the retention window")
+    if start + sum(offsets) > now + MAX_CLOCK_SKEW:
+        raise ValueError("samples must not be in the future")
+
+    if (
+        not isinstance(apps, list)
+        or len(apps) > MAX_WALKING_APPS
+        or not all(isinstance(app_id, str) for app_id in apps)
+    ):
+        raise ValueError(f"apps must be an array of at most {MAX_WALKING_APPS} strings")
+    if batch_id is not None and (
+        not isinstance(batch_id, str) or not 0 < len(batch_id) <= MAX_BATCH_ID_LENGTH
+    ):
+        raise ValueError(f"batch_id must be a string of at most {MAX_BATCH_ID_LENGTH} characters")
+
+    return {
+        'start': start,
+        'offsets': offsets,
+        'steps': steps,
+        'apps': apps,
+        'batch_id': batch_id,
+    }
+
+def _is_count(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+def aggregate_steps_by_day(start, offsets, steps):
+    """타임스탬프별 걸음 수를 날짜(YYYYMMDD)별 합계로 집계
+
+    offsets는 직전 샘플과의 간격(초)이고 첫 값은 start 기준이다.
+    """
+    utc_offset = int(WALKING_TZ.utcoffset(None).total_seconds())
+    totals = {}
+    ts = start + utc_offset
+    for offset, delta in zip(offsets, steps):
+        ts += offset
+        if delta:
+            day = ts // 86400
+            totals[day] = totals.get(day, 0) + delta
+
+    epoch = date(1970, 1, 1)
+    return {
+        (epoch + timedelta(days=day)).strftime('%Y%m%d'): total
+        for day, total in sorted(totals.items())
+    }
+
+def get_walking_key(user_id, day):
+    return f"walking:steps:{user_id}:{day}"
+
+def parse_user_uuid(user_id):
+    """DB에 저장할 사용자 ID (users.id UUID) 검증"""
+    try:
+        return str(uuid.UUID(user_id))
+    except ValueError:
+        return None
+
+INVALID_USER_ID = {"success": False, "error": "X-User-Id must be a user UUID"}
+USER_NOT_FOUND = {"success": False, "error": "User not found"}
+
+# 고정 응답 (한 번만 직렬화해서 재사용)
+COUPANG_EARNINGS_MOCK = frozen_json({
+    "error": "Coupang Partners API key not configured",
+    "mock_data": {
+        "daily_earnings": 12500,
+        "monthly_earnings": 385000,
+        "total_clicks": 1523,
+        "conversion_rate": 3.2
+    }
+})
+
+COUPANG_PRODUCTS_MOCK = frozen_json({
+    "products": [
+        {
+            "name": "샘플 상품 1",
+            "price": 15000,
+            "commission_rate": 3,
+            "link": "https://link.coupang.com/sample1"
+        },
+        {
+            "name": "샘플 상품 2",
+            "price": 25000,
+            "commission_rate": 5,
+            "link": "https://link.coupang.com/sample2"
+        }
+    ]
+})
+
+YOUTUBE_EARNINGS_MOCK = frozen_json({
+    "error": "YouTube API key not configured",
+    "mock_data": {
+        "daily_views": 5234,
+        "daily_earnings_krw": 6800,
+        "monthly_earnings_krw": 204000,
+        "subscribers": 1523
+    }
+})
+
+NAVER_EARNINGS_MOCK = frozen_json({
+    "error": "Naver API key not configured",
+    "mock_data": {
+        "daily_clicks": 234,
+        "daily_earnings_krw": 2340,
+        "monthly_earnings_krw": 70200,
+        "cpc_average": 10
+    }
+})
+
+SURVEYS = [
+    {
+        "id": "panel_now_1",
+        "platform": "패널나우",
+        "title": "2024 소비 트렌드 조사",
+        "reward": 2000,
+        "duration": 10,
+        "available": True
+    },
+    {
+        "id": "embrain_1",
+        "platform": "엠브레인",
+        "title": "모바일 앱 사용 패턴 조사",
+        "reward": 3500,
+        "duration": 15,
+        "available": True
+    },
+    {
+        "id": "panel_now_2",
+        "platform": "패널나우",
+        "title": "온라인 쇼핑 만족도 조사",
+        "reward": 1500,
+        "duration": 7,
+        "available": True
+    }
+]
+
+AVAILABLE_SURVEYS = frozen_json({
+    "surveys": SURVEYS,
+    "total_available": len(SURVEYS),
+    "total_rewards": sum(s['reward'] for s in SURVEYS)
+})
+
+DELIVERY_OPPORTUNITIES = frozen_json({
+    "baemin_connect": {
+        "available_zones": 15,
+        "average_earning_per_delivery": 4500,
+        "peak_hours": ["11:00-14:00", "18:00-21:00"],
+        "bonus_available": True
+    },
+    "coupang_flex": {
+        "available_blocks": 8,
+        "earning_per_block": 22000,
+        "block_duration": "3-4시간",
+        "new_driver_bonus": 50000
+    }
+})
+
+PLATFORM_SUMMARY_MOCK = frozen_json({
+    "total_platforms_connected": 5,
+    "today_earnings": 15234,
+    "this_month_earnings": 458700,
+    "total_earnings": 2345600,
+    "most_profitable_platform": "쿠팡 파트너스",
+    "daily_average": 15290,
+    "platforms": [
+        {"name": "쿠팡 파트너스", "earnings": 385000},
+        {"name": "캐시워크", "earnings": 6000},
+        {"name": "토스", "earnings": 27330},
+        {"name": "유튜브", "earnings": 204000},
+        {"name": "패널나우", "earnings": 35000}
+    ]
+})
+
 # API 엔드포인트들
 
-@app.route('/api/platforms/coupang_partners/earnings', methods=['GET'])
+@bp.errorhandler(db.UserNotFound)
+def handle_user_not_found(e):
+    return jsonify(USER_NOT_FOUND), 404
+
+@bp.errorhandler(db.DatabaseUnavailable)
+def handle_database_unavailable(e):
+    return jsonify({"success": False, "error": "Database unavailable"}), 503
+
+@bp.route('/api/platforms/coupang_partners/earnings', methods=['GET'])
 def get_coupang_earnings():
     """쿠팡 파트너스 수익 조회"""
     if not COUPANG_ACCESS_KEY:
-        return jsonify({
-            "error": "Coupang Partners API key not configured",
-            "mock_data": {
-                "daily_earnings": 12500,
-                "monthly_earnings": 385000,
-                "total_clicks": 1523,
-                "conversion_rate": 3.2
-            }
-        })
+        return COUPANG_EARNINGS_MOCK.response()
 
     cp = CoupangPartners()
     today = datetime.now().strftime('%Y%m%d')
@@ -168,70 +451,39 @@ def get_coupang_earnings():
             "error": "Failed to fetch data"
         })
 
-@app.route('/api/platforms/coupang_partners/products', methods=['GET'])
+@bp.route('/api/platforms/coupang_partners/products', methods=['GET'])
 def search_coupang_products():
     """쿠팡 상품 검색"""
     keyword = request.args.get('keyword', '추천상품')
 
     if not COUPANG_ACCESS_KEY:
-        return jsonify({
-            "products": [
-                {
-                    "name": "샘플 상품 1",
-                    "price": 15000,
-                    "commission_rate": 3,
-                    "link": "https://link.coupang.com/sample1"
-                },
-                {
-                    "name": "샘플 상품 2",
-                    "price": 25000,
-                    "commission_rate": 5,
-                    "link": "https://link.coupang.com/sample2"
-                }
-            ]
-        })
+        return COUPANG_PRODUCTS_MOCK.response()
 
     cp = CoupangPartners()
     products = cp.get_products(keyword)
 
     return jsonify(products) if products else jsonify({"products": []})
 
-@app.route('/api/platforms/youtube/earnings', methods=['GET'])
+@bp.route('/api/platforms/youtube/earnings', methods=['GET'])
 def get_youtube_earnings():
     """유튜브 수익 조회"""
     channel_id = request.args.get('channel_id')
 
     if not YOUTUBE_API_KEY:
-        return jsonify({
-            "error": "YouTube API key not configured",
-            "mock_data": {
-                "daily_views": 5234,
-                "daily_earnings_krw": 6800,
-                "monthly_earnings_krw": 204000,
-                "subscribers": 1523
-            }
-        })
+        return YOUTUBE_EARNINGS_MOCK.response()
 
     yt = YouTubeAnalytics()
     revenue = yt.get_estimated_revenue(channel_id)
 
     return jsonify(revenue) if revenue else jsonify({"error": "Failed to fetch data"})
 
-@app.route('/api/platforms/naver_adpost/earnings', methods=['GET'])
+@bp.route('/api/platforms/naver_adpost/earnings', methods=['GET'])
 def get_naver_earnings():
     """네이버 애드포스트 수익 조회"""
     blog_url = request.args.get('blog_url')
 
     if not NAVER_CLIENT_ID:
-        return jsonify({
-            "error": "Naver API key not configured",
-            "mock_data": {
-                "daily_clicks": 234,
-                "daily_earnings_krw": 2340,
-                "monthly_earnings_krw": 70200,
-                "cpc_average": 10
-            }
-        })
+        return NAVER_EARNINGS_MOCK.response()
 
     naver = NaverAdPost()
     stats = naver.get_blog_stats(blog_url)
@@ -246,7 +498,7 @@ def get_naver_earnings():
 
     return jsonify({"error": "Failed to fetch data"})
 
-@app.route('/api/platforms/<platform_id>/connect', methods=['POST'])
+@bp.route('/api/platforms/<platform_id>/connect', methods=['POST'])
 def connect_platform(platform_id):
     """플랫폼 연결"""
     user_id = request.headers.get('X-User-Id', 'default')
@@ -260,8 +512,12 @@ def connect_platform(platform_id):
         "status": "connected"
     }
 
-    # Redis나 DB에 저장
-    # redis_client.set(f"connection:{user_id}:{platform_id}", json.dumps(connection_info))
+    # DB에 저장
+    if db.is_configured():
+        user_uuid = parse_user_uuid(user_id)
+        if user_uuid is None:
+            return jsonify(INVALID_USER_ID), 400
+        db.connect_platform(user_uuid, platform_id)
 
     return jsonify({
         "success": True,
@@ -269,13 +525,17 @@ def connect_platform(platform_id):
         "message": f"{platform_id} connected successfully"
     })
 
-@app.route('/api/platforms/<platform_id>/disconnect', methods=['POST'])
+@bp.route('/api/platforms/<platform_id>/disconnect', methods=['POST'])
 def disconnect_platform(platform_id):
     """플랫폼 연결 해제"""
     user_id = request.headers.get('X-User-Id', 'default')
 
-    # Redis나 DB에서 삭제
-    # redis_client.delete(f"connection:{user_id}:{platform_id}")
+    # DB에서 연결 해제
+    if db.is_configured():
+        user_uuid = parse_user_uuid(user_id)
+        if user_uuid is None:
+            return jsonify(INVALID_USER_ID), 400
+        db.disconnect_platform(user_uuid, platform_id)
 
     return jsonify({
         "success": True,
@@ -283,7 +543,7 @@ def disconnect_platform(platform_id):
         "message": f"{platform_id} disconnected"
     })
 
-@app.route('/api/platforms/walking/sync', methods=['POST'])
+@bp.route('/api/platforms/walking/sync', methods=['POST'])
 def sync_walking_apps():
     """걷기 앱 데이터 동기화"""
     user_id = request.headers.get('X-User-Id', 'default')
@@ -293,17 +553,7 @@ def sync_walking_apps():
     apps = data.get('apps', [])
 
     # 각 앱별 예상 수익 계산
-    earnings = {}
-
-    if 'cashwalk' in apps:
-        earnings['cashwalk'] = min(steps / 100, 200)  # 100보당 1캐시, 최대 200
-
-    if 'toss' in apps:
-        earnings['toss'] = 911 if steps >= 10000 else steps * 0.0911
-
-    if 'cashdoc' in apps:
-        earnings['cashdoc'] = min(steps / 100, 150)
-
+    earnings = calculate_walking_rewards(steps, apps)
     total_earnings = sum(earnings.values())
 
     return jsonify({
@@ -313,88 +563,100 @@ def sync_walking_apps():
         "total_earnings": total_earnings
     })
 
-@app.route('/api/platforms/survey/available', methods=['GET'])
-def get_available_surveys():
-    """가능한 설문조사 목록"""
-    surveys = [
-        {
-            "id": "panel_now_1",
-            "platform": "패널나우",
-            "title": "2024 소비 트렌드 조사",
-            "reward": 2000,
-            "duration": 10,
-            "available": True
-        },
-        {
-            "id": "embrain_1",
-            "platform": "엠브레인",
-            "title": "모바일 앱 사용 패턴 조사",
-            "reward": 3500,
-            "duration": 15,
-            "available": True
-        },
-        {
-            "id": "panel_now_2",
-            "platform": "패널나우",
-            "title": "온라인 쇼핑 만족도 조사",
-            "reward": 1500,
-            "duration": 7,
-            "available": True
-        }
-    ]
+@bp.route('/api/platforms/walking/steps', methods=['POST'])
+def ingest_walking_steps():
+    """걸음 수 배치 업로드 (일별 합계 누적 후 보상 계산)"""
+    user_id = request.headers.get('X-User-Id', 'default')
+
+    try:
+        batch = parse_step_batch()
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    daily_steps = aggregate_steps_by_day(batch['start'], batch['offsets'], batch['steps'])
+
+    # 재전송된 배치는 누적하지 않고 현재 합계만 돌려준다.
+    # 중복 확인과 누적이 한 스크립트에서 실행되므로 중간에 실패해도
+    # 배치가 "처리됨"으로만 남는 일이 없다.
+    batch_key = f"walking:batch:{user_id}:{batch['batch_id']}" if batch['batch_id'] else ''
+    incr_daily_steps = connections.get_redis_script('incr_daily_steps', INCR_DAILY_STEPS_SCRIPT)
+    duplicate, totals = incr_daily_steps(
+        keys=[batch_key] + [get_walking_key(user_id, day) for day in daily_steps],
+        args=[WALKING_KEY_TTL, MAX_DAILY_STEPS] + list(daily_steps.values()),
+    )
+    duplicate = bool(duplicate)
+
+    days = []
+    for day, total in zip(daily_steps, totals):
+        earnings = calculate_walking_rewards(total, batch['apps'])
+        days.append({
+            "date": day,
+            "steps": total,
+            "earnings_by_app": earnings,
+            "total_earnings": round(sum(earnings.values()), 2)
+        })
 
     return jsonify({
-        "surveys": surveys,
-        "total_available": len(surveys),
-        "total_rewards": sum(s['reward'] for s in surveys)
+        "success": True,
+        "duplicate": duplicate,
+        "days": days,
+        "total_earnings": round(sum(d['total_earnings'] for d in days), 2)
     })
 
-@app.route('/api/platforms/delivery/opportunities', methods=['GET'])
+@bp.route('/api/platforms/survey/available', methods=['GET'])
+def get_available_surveys():
+    """가능한 설문조사 목록"""
+    return AVAILABLE_SURVEYS.response()
+
+@bp.route('/api/platforms/delivery/opportunities', methods=['GET'])
 def get_delivery_opportunities():
     """배달/배송 기회 조회"""
     location = request.args.get('location', '서울')
 
-    opportunities = {
-        "baemin_connect": {
-            "available_zones": 15,
-            "average_earning_per_delivery": 4500,
-            "peak_hours": ["11:00-14:00", "18:00-21:00"],
-            "bonus_available": True
-        },
-        "coupang_flex": {
-            "available_blocks": 8,
-            "earning_per_block": 22000,
-            "block_duration": "3-4시간",
-            "new_driver_bonus": 50000
-        }
-    }
-
-    return jsonify(opportunities)
+    return DELIVERY_OPPORTUNITIES.response()
 
-@app.route('/api/platforms/stats/summary', methods=['GET'])
+@bp.route('/api/platforms/stats/summary', methods=['GET'])
 def get_platform_summary():
     """전체 플랫폼 통계 요약"""
     user_id = request.headers.get('X-User-Id', 'default')
 
-    # 실제로는 DB에서 조회
-    summary = {
-        "total_platforms_connected": 5,
-        "today_earnings": 15234,
-        "this_month_earnings": 458700,
-        "total_earnings": 2345600,
-        "most_profitable_platform": "쿠팡 파트너스",
-        "daily_average": 15290,
-        "platforms": [
-            {"name": "쿠팡 파트너스", "earnings": 385000},
-            {"name": "캐시워크", "earnings": 6000},
-            {"name": "토스", "earnings": 27330},
-            {"name": "유튜브", "earnings": 204000},
-            {"name": "패널나우", "earnings": 35000}
-        ]
-    }
+    if not db.is_configured():
+        return PLATFORM_SUMMARY_MOCK.response()
+
+    user_uuid = parse_user_uuid(user_id)
+    if user_uuid is None:
+        return jsonify(INVALID_USER_ID), 400
+
+    earnings = db.get_earnings_summary(user_uuid)
+    if earnings is None:
+        return jsonify(USER_NOT_FOUND), 404
+    connected = db.get_connected_platforms(user_uuid)
+    platforms = earnings['platforms']
+
+    return jsonify({
+        "total_platforms_connected": len(connected),
+        "today_earnings": earnings['today_earnings'],
+        "this_month_earnings": earnings['this_month_earnings'],
+        "total_earnings": earnings['total_earnings'],
+        "most_profitable_platform": platforms[0]['name'] if platforms else None,
+        "daily_average": earnings['daily_average'],
+        "platforms": platforms
+    })
 
-    return jsonify(summary)
+def create_app():
+    """플랫폼 연동 앱 생성 (외부 API 세션은 워커별로 지연 생성)"""
+    app = Flask(__name__)
+    CORS(app)
+    fast_response.init_app(app)
+    app.register_blueprint(bp)
+    app.register_blueprint(health.health_bp)
+    health.register_readiness_check(app, 'http', connections.warm_http_session)
+    health.register_readiness_check(app, 'redis', connections.warm_redis)
+    if db.is_configured():
+        health.register_readiness_check(app, 'postgres', connections.warm_db)
+        health.register_metrics_provider(app, 'postgres', db.pool_metrics)
+    return app
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5001))
-    app.run(host='0.0.0.0', port=port)
\ No newline at end of file
+    create_app().run(host='0.0.0.0', port=port)
\ No newline at end of file
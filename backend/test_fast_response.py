@@ -0,0 +1,129 @@
+"""Tests for the shared response layer in fast_response.py."""
+import gzip
+
+import pytest
+from flask import Flask, jsonify
+
+import fast_response
+
+brotli = pytest.importorskip('brotli')
+
+SMALL = {'ok': True}
+LARGE = {'items': [{'id': i, 'name': f'item {i}'} for i in range(200)]}
+FROZEN = fast_response.frozen_json(LARGE)
+
+
+@pytest.fixture
+def client():
+    app = fast_response.init_app(Flask(__name__))
+
+    @app.get('/small')
+    def small():
+        return jsonify(SMALL)
+
+    @app.get('/large')
+    def large():
+        return jsonify(LARGE)
+
+    @app.get('/frozen')
+    def frozen():
+        return FROZEN.response()
+
+    @app.post('/large')
+    def create():
+        return jsonify(LARGE), 201
+
+    @app.get('/replaced')
+    def replaced():
+        response = jsonify(LARGE)
+        response.set_data(b'{"replaced":true}')
+        return response
+
+    return app.test_client()
+
+
+def decode(response):
+    encoding = response.headers.get('Content-Encoding')
+    if encoding == 'br':
+        return brotli.decompress(response.data)
+    if encoding == 'gzip':
+        return gzip.decompress(response.data)
+    return response.data
+
+
+@pytest.mark.parametrize('path', ['/large', '/frozen', '/small'])
+def test_matching_if_none_match_returns_304(client, path):
+    etag = client.get(path).headers['ETag']
+
+    response = client.get(path, headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+
+def test_stale_if_none_match_returns_body(client):
+    response = client.get('/large', headers={'If-None-Match': '"stale"'})
+
+    assert response.status_code == 200
+    assert decode(response) == fast_response.dumps(LARGE)
+
+
+@pytest.mark.parametrize('path', ['/large', '/frozen'])
+def test_etag_per_encoding(client, path):
+    identity = client.get(path).headers['ETag']
+    gzipped = client.get(path, headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+    brotlied = client.get(path, headers={'Accept-Encoding': 'br'}).headers['ETag']
+
+    assert len({identity, gzipped, brotlied}) == 3
+    assert gzipped.endswith('-gzip"')
+    assert brotlied.endswith('-br"')
+
+    # A tag for one encoding doesn't validate another.
+    response = client.get(path, headers={'Accept-Encoding': 'br', 'If-None-Match': gzipped})
+    assert response.status_code == 200
+
+
+def test_vary_only_above_threshold(client):
+    small = client.get('/small', headers={'Accept-Encoding': 'gzip, br'})
+    large = client.get('/large')
+
+    assert len(fast_response.dumps(SMALL)) < fast_response.COMPRESS_MIN_SIZE
+    assert 'Vary' not in small.headers
+    assert 'Content-Encoding' not in small.headers
+    assert small.data == fast_response.dumps(SMALL)
+    assert large.headers['Vary'] == 'Accept-Encoding'
+    assert client.get('/frozen').headers['Vary'] == 'Accept-Encoding'
+
+
+@pytest.mark.parametrize('accept, expected', [
+    ('gzip, br', 'br'),
+    ('br;q=0, gzip', 'gzip'),
+    ('gzip', 'gzip'),
+    ('gzip;q=0', None),
+    ('br;q=0, gzip;q=0', None),
+    ('', None),
+])
+@pytest.mark.parametrize('path', ['/large', '/frozen'])
+def test_encoding_negotiation(client, path, accept, expected):
+    response = client.get(path, headers={'Accept-Encoding': accept})
+
+    assert response.headers.get('Content-Encoding') == expected
+    assert decode(response) == fast_response.dumps(LARGE)
+
+
+def test_non_get_is_compressed_but_not_tagged(client):
+    response = client.post('/large', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.status_code == 201
+    assert 'ETag' not in response.headers
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+
+def test_replaced_body_is_left_alone(client):
+    response = client.get('/replaced', headers={'Accept-Encoding': 'gzip, br'})
+
+    assert response.data == b'{"replaced":true}'
+    assert 'ETag' not in response.headers
+    assert 'Content-Encoding' not in response.headers
+    assert 'Vary' not in response.headers
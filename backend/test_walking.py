@@ -0,0 +1,267 @@
+"""Tests for walking step ingestion in real_income_apis.py.
+
+Redis is replaced with fakeredis, which runs the Lua script through lupa.
+"""
+import gzip
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+import connections
+import real_income_apis
+from real_income_apis import (
+    MAX_BATCH_ID_LENGTH,
+    MAX_CLOCK_SKEW,
+    MAX_DAILY_STEPS,
+    MAX_STEP_BATCH_BYTES,
+    MAX_STEP_BATCH_POINTS,
+    MAX_STEP_DELTA,
+    MAX_WALKING_APPS,
+    WALKING_KEY_TTL,
+    WALKING_TZ,
+    aggregate_steps_by_day,
+    calculate_walking_rewards,
+    get_walking_key,
+)
+
+fakeredis = pytest.importorskip('fakeredis')
+pytest.importorskip('lupa')
+
+USER = 'walker'
+STEPS_URL = '/api/platforms/walking/steps'
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(connections, '_create_redis', lambda: client)
+    connections.reset_after_fork()
+    yield client
+    connections.reset_after_fork()
+
+
+@pytest.fixture
+def client(redis_client):
+    return real_income_apis.create_app().test_client()
+
+
+def make_batch(**overrides):
+    batch = {
+        'start': int(time.time()) - 3600,
+        'offsets': [0, 60, 60],
+        'steps': [100, 200, 300],
+        'apps': ['cashwalk', 'toss'],
+    }
+    batch.update(overrides)
+    return batch
+
+
+def post_batch(client, batch, **headers):
+    return client.post(STEPS_URL, json=batch, headers={'X-User-Id': USER, **headers})
+
+
+def post_body(client, body, **headers):
+    return client.post(STEPS_URL, data=body, headers={
+        'X-User-Id': USER, 'Content-Type': 'application/json', **headers,
+    })
+
+
+def kst_timestamp(*args):
+    return int(datetime(*args, tzinfo=WALKING_TZ).timestamp())
+
+
+# Aggregation
+
+def test_aggregate_splits_at_kst_midnight():
+    start = kst_timestamp(2024, 1, 1, 23, 59)
+
+    daily = aggregate_steps_by_day(start, [0, 30, 30, 30], [10, 20, 30, 40])
+
+    # 00:00:00 KST already belongs to the next day.
+    assert daily == {'20240101': 30, '20240102': 70}
+
+
+def test_aggregate_skips_empty_samples():
+    start = kst_timestamp(2024, 1, 1, 23, 59)
+
+    assert aggregate_steps_by_day(start, [0, 120], [10, 0]) == {'20240101': 10}
+
+
+# Rewards
+
+def test_rewards_capped_per_app():
+    earnings = calculate_walking_rewards(50000, ['cashwalk', 'toss', 'cashdoc', 'unknown'])
+
+    assert earnings == {'cashwalk': 200, 'toss': 911, 'cashdoc': 150}
+    assert calculate_walking_rewards(1000, ['toss']) == {'toss': 91.1}
+
+
+def test_rewards_below_threshold(monkeypatch):
+    monkeypatch.setitem(
+        real_income_apis.WALKING_REWARD_RULES,
+        'toss', {'rate': 0.0911, 'cap': 911, 'threshold': 10000},
+    )
+
+    assert calculate_walking_rewards(9999, ['toss']) == {'toss': 0}
+    assert calculate_walking_rewards(10000, ['toss']) == {'toss': 911}
+
+
+# Parsing
+
+def test_gzip_batch_accepted(client):
+    body = gzip.compress(json.dumps(make_batch()).encode())
+
+    response = post_body(client, body, **{'Content-Encoding': 'gzip'})
+
+    assert response.status_code == 200
+    assert sum(day['steps'] for day in response.get_json()['days']) == 600
+
+
+def test_oversized_raw_body_rejected(client):
+    batch = make_batch(apps=['x' * MAX_STEP_BATCH_BYTES])
+
+    response = post_batch(client, batch)
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'batch too large'
+
+
+def test_oversized_decompressed_body_rejected(client):
+    body = json.dumps(make_batch(apps=['x' * MAX_STEP_BATCH_BYTES])).encode()
+    body = gzip.compress(body)
+    assert len(body) < MAX_STEP_BATCH_BYTES
+
+    response = post_body(client, body, **{'Content-Encoding': 'gzip'})
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'batch too large'
+
+
+@pytest.mark.parametrize('body, headers, error', [
+    (b'not gzip', {'Content-Encoding': 'gzip'}, 'invalid gzip body'),
+    (b'{}', {'Content-Encoding': 'deflate'}, 'unsupported encoding'),
+    (b'[]', {}, 'batch must be an object'),
+])
+def test_bad_body_rejected(client, body, headers, error):
+    response = post_body(client, body, **headers)
+
+    assert response.status_code == 400
+    assert error in response.get_json()['error']
+
+
+def now():
+    return int(time.time())
+
+
+@pytest.mark.parametrize('overrides, error', [
+    ({'offsets': [0, 60]}, 'same length'),
+    ({'steps': {'0': 100}}, 'same length'),
+    ({'offsets': [0] * (MAX_STEP_BATCH_POINTS + 1),
+      'steps': [1] * (MAX_STEP_BATCH_POINTS + 1)}, 'samples per batch'),
+    ({'steps': [100, -1, 300]}, 'non-negative integers'),
+    ({'steps': [100, 1.5, 300]}, 'non-negative integers'),
+    ({'steps': [100, True, 300]}, 'non-negative integers'),
+    ({'offsets': [0, -60, 60]}, 'non-negative integers'),
+    ({'steps': [100, MAX_STEP_DELTA + 1, 300]}, 'steps per sample'),
+    ({'start': None}, 'retention window'),
+    ({'start': '1700000000'}, 'retention window'),
+    (lambda: {'start': now() - WALKING_KEY_TTL - 60}, 'retention window'),
+    (lambda: {'start': now() + MAX_CLOCK_SKEW + 60, 'offsets': [0, 0, 0]}, 'future'),
+    (lambda: {'start': now(), 'offsets': [0, 0, MAX_CLOCK_SKEW + 60]}, 'future'),
+    ({'apps': 'toss'}, 'apps must be'),
+    ({'apps': ['toss', 1]}, 'apps must be'),
+    ({'apps': ['app'] * (MAX_WALKING_APPS + 1)}, 'apps must be'),
+    ({'batch_id': 123}, 'batch_id'),
+    ({'batch_id': ''}, 'batch_id'),
+    ({'batch_id': 'x' * (MAX_BATCH_ID_LENGTH + 1)}, 'batch_id'),
+])
+def test_invalid_batch_rejected(client, redis_client, overrides, error):
+    if callable(overrides):
+        overrides = overrides()
+
+    response = post_batch(client, make_batch(**overrides))
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+    assert error in response.get_json()['error']
+    assert redis_client.keys() == []
+
+
+# Accumulation
+
+def today():
+    return datetime.now(WALKING_TZ).strftime('%Y%m%d')
+
+
+def midnight():
+    """Start of today (KST), so a test's samples never straddle two days"""
+    return kst_timestamp(*datetime.now(WALKING_TZ).timetuple()[:3])
+
+
+def test_steps_accumulate_per_day(client, redis_client):
+    batch = make_batch(start=midnight(), offsets=[0, 60], steps=[3000, 7000])
+
+    first = post_batch(client, batch).get_json()
+    second = post_batch(client, batch).get_json()
+
+    assert first['days'][0]['steps'] == 10000
+    assert second['duplicate'] is False
+    assert second['days'] == [{
+        'date': today(),
+        'steps': 20000,
+        'earnings_by_app': {'cashwalk': 200, 'toss': 911},
+        'total_earnings': 1111,
+    }]
+    assert int(redis_client.get(get_walking_key(USER, today()))) == 20000
+
+
+def test_duplicate_batch_not_counted_twice(client, redis_client):
+    batch = make_batch(start=midnight(), offsets=[0, 60], steps=[1000, 1000], batch_id='b1')
+
+    first = post_batch(client, batch).get_json()
+    retry = post_batch(client, batch).get_json()
+
+    assert first['duplicate'] is False
+    assert retry['duplicate'] is True
+    assert retry['days'] == first['days']
+    assert int(redis_client.get(get_walking_key(USER, today()))) == 2000
+
+    other = post_batch(client, dict(batch, batch_id='b2')).get_json()
+    assert other['days'][0]['steps'] == 4000
+
+
+def test_daily_total_clamped(client, redis_client):
+    samples = MAX_DAILY_STEPS // MAX_STEP_DELTA + 1
+    batch = make_batch(
+        start=midnight(), offsets=[0] + [1] * (samples - 1),
+        steps=[MAX_STEP_DELTA] * samples,
+    )
+
+    response = post_batch(client, batch).get_json()
+
+    assert response['days'][0]['steps'] == MAX_DAILY_STEPS
+    assert int(redis_client.get(get_walking_key(USER, today()))) == MAX_DAILY_STEPS
+
+
+def test_keys_expire_after_retention(client, redis_client):
+    batch = make_batch(start=midnight(), offsets=[0, 60], steps=[10, 10], batch_id='b1')
+
+    post_batch(client, batch)
+
+    day_ttl = redis_client.ttl(get_walking_key(USER, today()))
+    batch_ttl = redis_client.ttl(f'walking:batch:{USER}:b1')
+    assert WALKING_KEY_TTL - 5 <= day_ttl <= WALKING_KEY_TTL
+    assert WALKING_KEY_TTL - 5 <= batch_ttl <= WALKING_KEY_TTL
+
+
+def test_script_registered_once(client, redis_client):
+    batch = make_batch(start=midnight(), offsets=[0, 60], steps=[10, 10])
+
+    post_batch(client, batch)
+    script = connections.get_redis_script('incr_daily_steps', real_income_apis.INCR_DAILY_STEPS_SCRIPT)
+    post_batch(client, batch)
+
+    assert connections.get_redis_script(
+        'incr_daily_steps', real_income_apis.INCR_DAILY_STEPS_SCRIPT) is script